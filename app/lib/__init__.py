@@ -4,6 +4,11 @@ from .kpis import (
     calc_carryover_rate,
     calc_cycle_time,
     calc_defect_ratio,
+    compute_all_kpis,
+    kpi_table,
+    kpi_parts,
+    kpi_table_from_parts,
+    kpi_frames,
 )
 
 __all__ = [
@@ -12,4 +17,9 @@ __all__ = [
     "calc_carryover_rate",
     "calc_cycle_time",
     "calc_defect_ratio",
+    "compute_all_kpis",
+    "kpi_table",
+    "kpi_parts",
+    "kpi_table_from_parts",
+    "kpi_frames",
 ]
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import re
 import pandas as pd
 
@@ -33,26 +33,30 @@ _SYNONYMS: Dict[str, List[str]] = {
     "priority": ["priority", "prio"],
 }
 
+_NORM_RE = re.compile(r"[^a-z0-9]+")
+
 def _norm(s: str) -> str:
-    return re.sub(r"[^a-z0-9]+", " ", str(s).strip().lower()).strip()
+    return _NORM_RE.sub(" ", str(s).strip().lower()).strip()
+
+# Normalized synonym -> [(canonical field, synonym rank)]; earlier synonyms win.
+# A phrase may serve several fields (e.g. "sprint name"), hence the list.
+_SYN_REV: Dict[str, List[Tuple[str, int]]] = {}
+for _target, _syns in _SYNONYMS.items():
+    for _rank, _s in enumerate(_syns + [_target.replace("_", " ")]):  # include canonical as phrase
+        _SYN_REV.setdefault(_norm(_s), []).append((_target, _rank))
 
 def infer_mapping(df: pd.DataFrame) -> Dict[str, Optional[str]]:
     """Best-effort mapping from uploaded headers to canonical headers."""
-    src_cols_norm = {c: _norm(c) for c in df.columns}
     mapping: Dict[str, Optional[str]] = {k: None for k in REQUIRED_CANONICAL + OPTIONAL_CANONICAL}
 
-    # 1) exact or normalized match
-    rev = {v: k for k, v in src_cols_norm.items()}
-    for target, syns in _SYNONYMS.items():
-        for s in syns + [target.replace("_", " ")]:  # include canonical as phrase
-            ns = _norm(s)
-            # direct normalized hit
-            for src, nsrc in src_cols_norm.items():
-                if nsrc == ns:
-                    mapping[target] = src
-                    break
-            if mapping[target]:
-                break
+    # 1) exact or normalized match: one lookup per source column; for each field the
+    #    best-ranked synonym wins, ties go to the leftmost column
+    best_rank: Dict[str, int] = {}
+    for src in df.columns:
+        for target, rank in _SYN_REV.get(_norm(src), ()):
+            if target not in best_rank or rank < best_rank[target]:
+                best_rank[target] = rank
+                mapping[target] = src
 
     # 2) heuristics for sprint fields inside a single "sprint" text column
     # keep None; UI will allow manual selection
@@ -1,21 +1,51 @@
 from __future__ import annotations
+import io
+import os
+import tempfile
 import pandas as pd
+import streamlit as st
+from .schema import validate_and_normalize
+from .utils import coerce_dates
+
+try:
+    from pyarrow import ArrowInvalid  # multithreaded CSV reader; ships with streamlit
+    _CSV_ENGINE = "pyarrow"
+except ImportError:
+    ArrowInvalid = ValueError
+    _CSV_ENGINE = "c"
 
 REQUIRED_COLS = {
     "issue_id","issue_type","status","story_points",
     "created","resolved","sprint_id","sprint_start","sprint_end",
 }
 
+def _read_csv(src: str | bytes) -> pd.DataFrame:
+    """Read a CSV path or raw bytes, preferring the pyarrow engine.
+
+    pyarrow rejects rows with fewer fields than the header (e.g. trailing
+    optional columns left off); the C reader pads those with NaN, so retry with it.
+    """
+    def _src():
+        return io.BytesIO(src) if isinstance(src, bytes) else src
+    if _CSV_ENGINE == "pyarrow":
+        try:
+            return pd.read_csv(_src(), engine="pyarrow")
+        except (pd.errors.ParserError, ArrowInvalid):
+            pass
+    return pd.read_csv(_src(), engine="c")
+
+def read_csv_bytes(raw: bytes) -> pd.DataFrame:
+    """Parse uploaded CSV bytes with the same reader as load_sprint_csv."""
+    return _read_csv(raw)
+
 def load_sprint_csv(path: str) -> pd.DataFrame:
-    df = pd.read_csv(path)
+    df = _read_csv(path)
     missing = REQUIRED_COLS - set(df.columns)
     if missing:
         raise ValueError(f"Missing columns: {sorted(missing)}")
 
-    # parse dates if present
-    for c in ["created","updated","resolved","sprint_start","sprint_end","in_progress_start"]:
-        if c in df.columns:
-            df[c] = pd.to_datetime(df[c], utc=True, errors="coerce")
+    # parse dates if present; the pyarrow reader already types ISO timestamps
+    coerce_dates(df, ["created","updated","resolved","sprint_start","sprint_end","in_progress_start"])
 
     # normalize types
     if "issue_type" in df.columns:
@@ -23,3 +53,45 @@ def load_sprint_csv(path: str) -> pd.DataFrame:
     if "status" in df.columns:
         df["status"] = df["status"].astype(str).str.strip().str.lower()
     return df
+
+CATEGORY_COLS = ("sprint_id", "issue_type", "status", "assignee")
+
+def categorize(df: pd.DataFrame) -> pd.DataFrame:
+    """Store low-cardinality label columns as categoricals for cheap filters and groupbys."""
+    cols = {c: "category" for c in CATEGORY_COLS if c in df.columns}
+    return df.astype(cols) if cols else df
+
+def load_validated_csv(path: str) -> pd.DataFrame:
+    """Load, validate and categorize a sprint CSV once per file version, shared by all pages.
+
+    The returned frame is shared across sessions; treat it as read-only.
+    """
+    return _load_validated_at(path, os.path.getmtime(path))
+
+# cache_resource hands back the shared frame instead of a pickled copy per call
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _load_validated_at(path: str, mtime: float) -> pd.DataFrame:
+    # Validated parquet sidecar skips the CSV parse + validation on cold starts;
+    # the mtime check (and cache key) invalidates it when the CSV is edited
+    pq = os.path.splitext(path)[0] + ".parquet"
+    if os.path.exists(pq) and os.path.getmtime(pq) >= mtime:
+        try:
+            return categorize(pd.read_parquet(pq))
+        except Exception:
+            pass  # unreadable sidecar: rebuild it from the CSV below
+    df = categorize(validate_and_normalize(load_sprint_csv(path)))
+    _write_sidecar(df, pq)
+    return df
+
+def _write_sidecar(df: pd.DataFrame, pq: str) -> None:
+    """Best-effort parquet cache write; the atomic swap means readers never see a partial file."""
+    tmp = None
+    try:
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(pq) or ".", suffix=".parquet.tmp")
+        os.close(fd)
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, pq)
+    except Exception:
+        # read-only deploys (or a failed write) just keep the in-memory cache
+        if tmp is not None and os.path.exists(tmp):
+            os.unlink(tmp)
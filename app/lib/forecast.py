@@ -2,13 +2,17 @@ from __future__ import annotations
 import numpy as np, pandas as pd
 from .kpis import calc_velocity
 
+_QUANTILES = (0.10, 0.50, 0.90)
+
 def velocity_history(df: pd.DataFrame) -> pd.Series:
     """Return ordered historical velocity series as float."""
     v = calc_velocity(df)
     v = v.sort_values("sprint_id")["velocity_sp"].dropna().astype(float)
     return v
 
-def mc_velocity_forecast(df: pd.DataFrame, horizon: int = 3, draws: int = 8000) -> pd.DataFrame:
+def mc_velocity_forecast(
+    df: pd.DataFrame, horizon: int = 3, draws: int = 8000, seed: int | None = None
+) -> pd.DataFrame:
     """Monte-Carlo forecast over historical velocity with bootstrap resampling.
 
     Returns columns: step, mean, p10, p50, p90
@@ -16,9 +20,16 @@ def mc_velocity_forecast(df: pd.DataFrame, horizon: int = 3, draws: int = 8000)
     hist = velocity_history(df).values.astype(float)
     if hist.size == 0:
         return pd.DataFrame({"step": [], "mean": [], "p10": [], "p50": [], "p90": []})
-    samples = np.random.choice(hist, size=(draws, horizon), replace=True)
-    mean = samples.mean(axis=0)
-    p10  = np.percentile(samples, 10, axis=0)
-    p50  = np.percentile(samples, 50, axis=0)
-    p90  = np.percentile(samples, 90, axis=0)
-    return pd.DataFrame({"step": np.arange(1, horizon+1), "mean": mean, "p10": p10, "p50": p50, "p90": p90}).round(2)
+    rng = np.random.default_rng(seed)
+    # Steps are i.i.d., so stream one draws-sized column at a time instead of
+    # materializing the full draws x horizon matrix.
+    stats = np.empty((horizon, 4))
+    for s in range(horizon):
+        # Draw integer indices and gather; cheaper than rng.choice for short histories
+        col = hist[rng.integers(0, hist.size, size=draws, dtype=np.int32)]
+        stats[s, 0] = col.mean()
+        stats[s, 1:] = np.quantile(col, _QUANTILES)
+    return pd.DataFrame({
+        "step": np.arange(1, horizon+1),
+        "mean": stats[:, 0], "p10": stats[:, 1], "p50": stats[:, 2], "p90": stats[:, 3],
+    }).round(2)
@@ -6,19 +6,26 @@ def _safe_num(s) -> pd.Series:
     """Convert a sequence to numeric Series and drop NaNs."""
     return pd.to_numeric(pd.Series(s), errors="coerce").dropna()
 
-def velocity_insights(df: pd.DataFrame, fc: pd.DataFrame) -> list[tuple[str,str]]:
-    """Derive short velocity commentary given history and forecast bands."""
+def velocity_insights(
+    df: pd.DataFrame, fc: pd.DataFrame, vel_hist: np.ndarray | None = None,
+) -> list[tuple[str,str]]:
+    """Derive short velocity commentary given history and forecast bands.
+
+    Pass ``vel_hist`` (per-sprint velocity in sprint order) when the caller has
+    already computed KPIs, to skip re-running ``calc_velocity`` on ``df``.
+    """
     msgs: list[tuple[str,str]] = []
-    vel = calc_velocity(df)
-    hist = _safe_num(vel["velocity_sp"])
+    if vel_hist is None:
+        vel_hist = calc_velocity(df)["velocity_sp"]
+    hist = _safe_num(vel_hist).to_numpy(dtype=float)
     if len(hist) < 3:
         msgs.append(("warning","Limited history. Add more sprints for a better forecast."))
         return msgs
-    slope = hist.diff().dropna().mean()
+    slope = float(np.mean(np.diff(hist)))
     if abs(slope) < 0.2: msgs.append(("info","Velocity trend is flat/stable."))
     elif slope > 0:      msgs.append(("success","Velocity is trending upward."))
     else:                msgs.append(("warning","Velocity is trending downward."))
-    mean, std = float(hist.mean()), float(hist.std(ddof=1))
+    mean, std = float(hist.mean()), float(np.std(hist, ddof=1))
     cv = (std/mean) if mean else np.inf
     if cv < 0.10: msgs.append(("success","Past velocity is very stable (low variability)."))
     elif cv < 0.25: msgs.append(("info","Past velocity variability is moderate."))
@@ -1,58 +1,139 @@
 from __future__ import annotations
+import numpy as np
 import pandas as pd
 
-def _resolved_within_sprint(df: pd.DataFrame) -> pd.DataFrame:
-    d = df.copy()
-    # Defensive: coerce date-like columns to datetime (handles strings in tests/uploads)
-    for c in ("sprint_start", "sprint_end", "resolved"):
-        if c in d.columns:
-            d[c] = pd.to_datetime(d[c], errors="coerce", utc=True)
+_NS_PER_DAY = 86_400_000_000_000
+
+def _to_utc(s: pd.Series) -> pd.Series:
+    """Return s as tz-aware datetimes, parsing only when not already typed."""
+    if isinstance(s.dtype, pd.DatetimeTZDtype):
+        return s
+    return pd.to_datetime(s, errors="coerce", utc=True)
+
+def _resolved_mask(df: pd.DataFrame) -> tuple[pd.Series, dict[str, pd.Series]]:
+    """Return the done-within-sprint row mask and the parsed sprint/resolved dates."""
+    # Defensive: coerce date-like columns to datetime (handles strings in tests/uploads);
+    # already-typed columns pass through without a re-parse or a full-frame copy
+    dates = {c: _to_utc(df[c]) for c in ("sprint_start", "sprint_end", "resolved") if c in df.columns}
 
     ok = (
-        d["sprint_id"].notna()
-        & d["sprint_start"].notna()
-        & d["sprint_end"].notna()
-        & d["resolved"].notna()
-        & (d["resolved"] >= d["sprint_start"])
-        & (d["resolved"] <= d["sprint_end"])
-        & (d["status"].str.lower().str.contains("done") | d["status"].str.lower().str.contains("closed"))
+        df["sprint_id"].notna()
+        & dates["sprint_start"].notna()
+        & dates["sprint_end"].notna()
+        & dates["resolved"].notna()
+        & (dates["resolved"] >= dates["sprint_start"])
+        & (dates["resolved"] <= dates["sprint_end"])
+        & df["status"].str.contains("done|closed", case=False, na=False)
+    )
+    return ok, dates
+
+def _per_sprint(values: pd.Series, name: str) -> pd.DataFrame:
+    """Flatten a sprint-indexed aggregate into a (sprint_id, name) frame with plain ids.
+
+    Groupbys run with sort=False; ordering happens here, on the small output only.
+    """
+    out = pd.DataFrame({"sprint_id": values.index.astype(object), name: values.to_numpy()})
+    return out.sort_values("sprint_id", ignore_index=True)
+
+
+def kpi_parts(df: pd.DataFrame) -> pd.DataFrame:
+    """Per-row KPI inputs (one row per issue, positionally aligned with df).
+
+    Row-filtering this frame and passing it to kpi_table_from_parts gives the
+    same result as kpi_table on the filtered df, without redoing the per-row work.
+    """
+    ok, dates = _resolved_mask(df)
+    ok = ok.to_numpy(dtype=bool)
+    has_id = df["issue_id"].notna().to_numpy()
+    # Integer-nanosecond arithmetic straight on the datetime64 buffers; NaT -> NaN
+    r = dates["resolved"].to_numpy(dtype="datetime64[ns]")
+    c = _to_utc(df["created"]).to_numpy(dtype="datetime64[ns]")
+    days = (r.view("i8") - c.view("i8")) * (1.0 / _NS_PER_DAY)
+    days[np.isnat(r) | np.isnat(c) | ~ok] = np.nan
+    sp = pd.to_numeric(df["story_points"], errors="coerce").to_numpy(dtype=float)
+    bug = df["issue_type"].str.contains("bug|defect", case=False, na=False).to_numpy(dtype=bool)
+    return pd.DataFrame({
+        # .array keeps a categorical sprint_id categorical, so the groupby runs on its codes
+        "sprint_id": df["sprint_id"].array,
+        "started": has_id,
+        "resolved": ok,
+        "done": ok & has_id,
+        "story_points": np.where(ok, sp, np.nan),
+        "bugs": ok & bug,
+        "cycle_days": days,
+    })
+
+def _kpi_aggregate(parts: pd.DataFrame) -> pd.DataFrame:
+    """One groupby over all sprint rows yielding every KPI input per sprint."""
+    # NaN sprint ids are dropped by groupby
+    return parts.groupby("sprint_id", sort=False, observed=True).agg(
+        started=("started", "sum"),
+        resolved=("resolved", "sum"),
+        done=("done", "sum"),
+        velocity_sp=("story_points", "sum"),
+        bugs=("bugs", "sum"),
+        cycle_median_days=("cycle_days", "median"),
     )
-    return d[ok]
 
 
 def calc_velocity(df: pd.DataFrame) -> pd.DataFrame:
-    d = _resolved_within_sprint(df)
-    out = d.groupby("sprint_id")["story_points"].sum(min_count=1).reset_index(name="velocity_sp").fillna(0.0)
-    return out
+    # Standalone path (forecast/insights) only needs story points, so skip the fused table
+    # Mask just the two columns it reads rather than row-filtering the whole frame
+    ok, _ = _resolved_mask(df)
+    sp = pd.to_numeric(df["story_points"][ok], errors="coerce")
+    vel = sp.groupby(df["sprint_id"][ok], sort=False, observed=True).sum()
+    return _per_sprint(vel.fillna(0.0), "velocity_sp")
 
 def calc_throughput(df: pd.DataFrame) -> pd.DataFrame:
-    d = _resolved_within_sprint(df)
-    out = d.groupby("sprint_id")["issue_id"].count().reset_index(name="throughput_issues")
-    return out
+    return compute_all_kpis(df)["throughput"]
 
 def calc_carryover_rate(df: pd.DataFrame) -> pd.DataFrame:
-    d = df.copy()
-    in_sprint = d[d["sprint_id"].notna()]
-    started = in_sprint.groupby("sprint_id")["issue_id"].count().reset_index(name="started")
-    done = _resolved_within_sprint(df).groupby("sprint_id")["issue_id"].count().reset_index(name="done")
-    merged = started.merge(done, on="sprint_id", how="left").fillna({"done": 0})
-    merged["carryover_rate"] = ((merged["started"] - merged["done"]).clip(lower=0)) / merged["started"].replace({0: 1})
-    return merged[["sprint_id","carryover_rate"]].round(3)
+    return compute_all_kpis(df)["carryover"]
 
 def calc_cycle_time(df: pd.DataFrame) -> pd.DataFrame:
-    d = _resolved_within_sprint(df).copy()
-    for c in ("created", "resolved"):
-        if c in d.columns:
-            d[c] = pd.to_datetime(d[c], errors="coerce", utc=True)
-    d["cycle_days"] = (d["resolved"] - d["created"]).dt.total_seconds() / 86400.0
-    g = d.groupby("sprint_id")["cycle_days"]
-    out = g.median().reset_index(name="cycle_median_days").round(2)
-    return out
-
+    return compute_all_kpis(df)["cycle_time"]
 
 def calc_defect_ratio(df: pd.DataFrame) -> pd.DataFrame:
-    d = _resolved_within_sprint(df).copy()
-    d["is_defect"] = d["issue_type"].str.lower().str.contains("bug|defect")
-    g = d.groupby("sprint_id")
-    res = (g["is_defect"].sum() / g["issue_id"].count()).reset_index(name="defect_ratio").fillna(0.0).round(3)
-    return res
+    return compute_all_kpis(df)["defect_ratio"]
+
+
+def kpi_table(df: pd.DataFrame) -> pd.DataFrame:
+    """All five KPIs per sprint from a single groupby, indexed by sorted sprint_id.
+
+    Velocity, throughput, cycle time and defect ratio are NaN for sprints with
+    no work resolved inside the sprint window.
+    """
+    return kpi_table_from_parts(kpi_parts(df))
+
+def kpi_table_from_parts(parts: pd.DataFrame) -> pd.DataFrame:
+    """kpi_table over precomputed (possibly row-filtered) kpi_parts rows."""
+    agg = _kpi_aggregate(parts)
+    started = agg["started"].to_numpy(dtype=float)
+    done = agg["done"].to_numpy(dtype=float)
+    has_res = agg["resolved"].to_numpy() > 0
+    carry = np.where(started > 0, (started - done) / np.where(started > 0, started, 1.0), 0.0)
+    defect = np.where(done > 0, agg["bugs"].to_numpy(dtype=float) / np.where(done > 0, done, 1.0), 0.0)
+    out = pd.DataFrame({
+        "velocity_sp": np.where(has_res, agg["velocity_sp"].to_numpy(dtype=float), np.nan),
+        "throughput_issues": np.where(has_res, done, np.nan),
+        "carryover_rate": carry.round(3),
+        "cycle_median_days": np.where(has_res, agg["cycle_median_days"].to_numpy(dtype=float), np.nan).round(2),
+        "defect_ratio": np.where(has_res, defect, np.nan).round(3),
+    }, index=pd.Index(agg.index.astype(object), name="sprint_id"))
+    return out.sort_index()
+
+
+def compute_all_kpis(df: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    """Compute all five per-sprint KPI frames from one pass over the data."""
+    return kpi_frames(kpi_table(df))
+
+def kpi_frames(t: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    """Split a kpi_table into the five (sprint_id, value) frames of compute_all_kpis."""
+    resolved = t[t["throughput_issues"].notna()].astype({"throughput_issues": "int64"})
+    return {
+        "velocity": resolved[["velocity_sp"]].reset_index(),
+        "throughput": resolved[["throughput_issues"]].reset_index(),
+        "carryover": t[["carryover_rate"]].reset_index(),
+        "cycle_time": resolved[["cycle_median_days"]].reset_index(),
+        "defect_ratio": resolved[["defect_ratio"]].reset_index(),
+    }
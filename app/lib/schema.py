@@ -1,6 +1,7 @@
 from __future__ import annotations
-from typing import Optional, Iterable
+from typing import Optional, Iterable, Union
 from datetime import datetime
+import numpy as np
 import pandas as pd
 from pydantic import BaseModel, Field, ValidationError
 from .utils import coerce_dates, coerce_nums, nan_to_none_for_optional
@@ -35,10 +36,75 @@ DATE_COLS = {"created","updated","resolved","sprint_start","sprint_end"}
 NUM_COLS  = {"story_points"}
 OPTIONAL_STR_COLS = {"assignee","reporter","sprint_name","parent_id","labels","priority"}
 OPTIONAL_NUM_COLS = {"story_points"}
+# Fields Issue declares as required (non-Optional) and as str
+NON_NULL_COLS = ("issue_id","issue_type","status","created","sprint_id","sprint_start","sprint_end")
+STR_COLS = ("issue_id","issue_type","status","sprint_id","assignee","reporter","sprint_name","parent_id","labels","priority")
+MAX_ROW_ERRORS = 5
 
-def validate_and_normalize(df: pd.DataFrame, validate_rows: bool = True) -> pd.DataFrame:
+def _row_errors(errs: list[str], more: bool) -> ValueError:
+    if more:
+        errs = errs + ["…more rows invalid"]
+    return ValueError("Row validation failed: " + " | ".join(errs))
+
+def _fast_validate(df: pd.DataFrame, bad_dates: Optional[dict[str, np.ndarray]] = None) -> None:
+    """Vectorized equivalent of validating every row against Issue.
+
+    ``bad_dates`` maps required date columns to rows that held a value before
+    date coercion but came out NaT; those are reported as invalid, not missing.
+
+    Raises:
+        ValueError: listing the first offending rows by position.
+    """
+    bad_dates = bad_dates or {}
+    checks: list[tuple[np.ndarray, str]] = []
+    for c in NON_NULL_COLS:
+        if c in df.columns:
+            null = df[c].isna().to_numpy()
+            if c in bad_dates:
+                checks.append((bad_dates[c], f"'{c}' is not a valid date"))
+                null = null & ~bad_dates[c]
+            checks.append((null, f"'{c}' is required"))
+    for c in STR_COLS:
+        if c in df.columns and pd.api.types.infer_dtype(df[c], skipna=True) not in ("string", "empty"):
+            s = df[c]
+            not_str = s.notna() & ~s.map(lambda v: isinstance(v, str)).astype(bool)
+            checks.append((not_str.to_numpy(), f"'{c}' must be a string"))
+    if "story_points" in df.columns:
+        sp = pd.to_numeric(df["story_points"], errors="coerce")
+        checks.append(((sp < 0).to_numpy(), "'story_points' must be >= 0"))
+    if not checks:
+        return
+    bad = np.flatnonzero(np.logical_or.reduce([m for m, _ in checks]))
+    if bad.size:
+        errs = [
+            f"row {i}: " + "; ".join(msg for m, msg in checks if m[i])
+            for i in bad[:MAX_ROW_ERRORS]
+        ]
+        raise _row_errors(errs, bad.size > MAX_ROW_ERRORS)
+
+def _pydantic_validate(df: pd.DataFrame) -> None:
+    """Validate each row through the Issue model (slow; strict/debug path)."""
+    present = [c for c in CSV_HEADERS if c in df.columns]
+
+    errs = []
+    # Build each record once from plain tuples, mapping NaN/NaT to None on the way
+    for idx, row in enumerate(df[present].itertuples(index=False, name=None)):
+        rec = {k: (None if pd.isna(v) else v) for k, v in zip(present, row)}
+        try:
+            Issue.model_validate(rec)
+        except ValidationError as e:
+            errs.append(f"row {idx}: {e.errors()}")
+            if len(errs) >= MAX_ROW_ERRORS:
+                raise _row_errors(errs, True)
+    if errs:
+        raise _row_errors(errs, False)
+
+def validate_and_normalize(df: pd.DataFrame, validate_rows: Union[bool, str] = True) -> pd.DataFrame:
     """Validate headers and rows, coerce dtypes, and return a clean DataFrame.
 
+    Rows are checked with vectorized predicates mirroring ``Issue``; pass
+    ``validate_rows="strict"`` to run every row through the Pydantic model.
+
     Raises:
         ValueError: when required columns are missing or row validation fails.
     """
@@ -48,6 +114,8 @@ def validate_and_normalize(df: pd.DataFrame, validate_rows: bool = True) -> pd.D
         problems.append(f"Missing columns: {sorted(missing)}")
     out = df.copy()
 
+    # Required dates present before coercion; NaT afterwards means unparseable, not missing
+    had_date = {c: out[c].notna().to_numpy() for c in NON_NULL_COLS if c in DATE_COLS and c in out.columns}
     coerce_dates(out, DATE_COLS)
     coerce_nums(out, NUM_COLS)
 
@@ -67,32 +135,12 @@ def validate_and_normalize(df: pd.DataFrame, validate_rows: bool = True) -> pd.D
     nan_to_none_for_optional(out, OPTIONAL_STR_COLS, OPTIONAL_NUM_COLS)
 
     if validate_rows:
-        present = [c for c in CSV_HEADERS if c in out.columns]
-
-        def _noneify_nan(rec: dict) -> dict:
-            return {k: (None if pd.isna(v) else v) for k, v in rec.items()}
-
-        errs = []
-        for c in OPTIONAL_NUM_COLS:
-            if c in out.columns:
-                s = out[c].astype("object")
-                out[c] = s.where(pd.notna(s), None)
-
-        for c in OPTIONAL_STR_COLS:
-            if c in out.columns:
-                s = out[c].astype("object")
-                out[c] = s.where(pd.notna(s), None)
-
-
-        for idx, rec in enumerate(out[present].to_dict(orient="records")):
-            try:
-                Issue.model_validate(_noneify_nan(rec))
-            except ValidationError as e:
-                errs.append(f"row {idx}: {e.errors()}")
-                if len(errs) >= 5:
-                    errs.append("…more rows invalid")
-                    break
-        if errs:
-            raise ValueError("Row validation failed: " + " | ".join(errs))
+        if validate_rows == "strict":
+            _pydantic_validate(out)
+        else:
+            _fast_validate(out, {c: m & out[c].isna().to_numpy() for c, m in had_date.items()})
+    if "sprint_id" in out.columns:
+        # Group/filter/nunique on sprint_id then run over int codes, not string hashes
+        out["sprint_id"] = out["sprint_id"].astype("category")
     return out
 
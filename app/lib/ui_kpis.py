@@ -1,32 +1,30 @@
 from __future__ import annotations
+import numpy as np
 import pandas as pd
 import streamlit as st
-from .kpis import (
-    calc_velocity, calc_throughput, calc_carryover_rate,
-    calc_cycle_time, calc_defect_ratio,
-)
+from .kpis import kpi_table
+from .utils import frame_fingerprint
 
 __all__ = ["compute_summary", "render_summary_cards"]
 
-def _sprint_order(df: pd.DataFrame) -> list[str]:
-    """Return sprint ids ordered by their earliest sprint_start."""
+def _sprint_starts(df: pd.DataFrame) -> pd.Series:
+    """Return each sprint's start date indexed by sprint_id."""
+    # Each sprint has one canonical start, so a hash dedup replaces a groupby-min
     return (
-        df.groupby("sprint_id")["sprint_start"]
-        .min()
-        .sort_values()
-        .index.tolist()
+        df[["sprint_id", "sprint_start"]]
+        .dropna(subset=["sprint_id"])
+        .drop_duplicates("sprint_id")
+        .set_index("sprint_id")["sprint_start"]
     )
 
-def _latest_and_delta(metric_df: pd.DataFrame, value_col: str, order: list[str]) -> tuple[float, float]:
-    """Return latest value and % delta vs previous sprint for a KPI frame."""
-    d = metric_df.copy()
-    d["sprint_id"] = pd.Categorical(d["sprint_id"], categories=order, ordered=True)
-    d = d.sort_values("sprint_id").reset_index(drop=True)
-    vals = d[value_col].astype(float).tolist()
-    if not vals:
+def _latest_and_delta(values: pd.Series) -> tuple[float, float]:
+    """Return latest value and % delta vs previous sprint for a chronologically ordered KPI column."""
+    vals = values.to_numpy(dtype=np.float64)
+    vals = vals[~np.isnan(vals)]
+    if not vals.size:
         return 0.0, 0.0
     latest = float(vals[-1])
-    prev = float(vals[-2]) if len(vals) > 1 else None
+    prev = float(vals[-2]) if vals.size > 1 else None
     if prev in (None, 0.0):
         delta = 0.0
     else:
@@ -35,18 +33,23 @@ def _latest_and_delta(metric_df: pd.DataFrame, value_col: str, order: list[str])
 
 def compute_summary(df: pd.DataFrame) -> dict:
     """Compute latest KPI values and % deltas keyed by display label."""
-    order = _sprint_order(df)
-    vel = calc_velocity(df)
-    thr = calc_throughput(df)
-    car = calc_carryover_rate(df)
-    cyc = calc_cycle_time(df)
-    dr  = calc_defect_ratio(df)
+    # Streamlit hashes only the fingerprint; its default DataFrame hasher is slow
+    return _compute_summary_cached(frame_fingerprint(df), df)
+
+@st.cache_data(show_spinner=False)
+def _compute_summary_cached(fingerprint: str, _df: pd.DataFrame) -> dict:
+    return _summary_from_table(kpi_table(_df), _df)  # one groupby for all five KPIs
+
+def _summary_from_table(kpi: pd.DataFrame, df: pd.DataFrame) -> dict:
+    """Summary dict from df's kpi_table (e.g. one built from sliced kpi_parts)."""
+    # Sort the small per-sprint table once instead of reordering each KPI
+    kpi = kpi.loc[_sprint_starts(df).reindex(kpi.index).sort_values(kind="stable").index]
     return {
-        "Velocity (SP)":        dict(zip(["value","delta"], _latest_and_delta(vel,"velocity_sp",order))),
-        "Throughput (issues)":  dict(zip(["value","delta"], _latest_and_delta(thr,"throughput_issues",order))),
-        "Carryover rate":       dict(zip(["value","delta"], _latest_and_delta(car,"carryover_rate",order))),
-        "Cycle time (days)":    dict(zip(["value","delta"], _latest_and_delta(cyc,"cycle_median_days",order))),
-        "Defect ratio":         dict(zip(["value","delta"], _latest_and_delta(dr,"defect_ratio",order))),
+        "Velocity (SP)":        dict(zip(["value","delta"], _latest_and_delta(kpi["velocity_sp"]))),
+        "Throughput (issues)":  dict(zip(["value","delta"], _latest_and_delta(kpi["throughput_issues"]))),
+        "Carryover rate":       dict(zip(["value","delta"], _latest_and_delta(kpi["carryover_rate"]))),
+        "Cycle time (days)":    dict(zip(["value","delta"], _latest_and_delta(kpi["cycle_median_days"]))),
+        "Defect ratio":         dict(zip(["value","delta"], _latest_and_delta(kpi["defect_ratio"]))),
     }
 
 def _delta_badge(delta: float) -> str:
@@ -55,9 +58,22 @@ def _delta_badge(delta: float) -> str:
     color = "green" if delta >= 0 else "red"
     return f":{color}[{arrow} {delta:.1f}%]"
 
-def render_summary_cards(df: pd.DataFrame) -> None:
-    """Render five summary KPI cards with value and delta."""
-    data = compute_summary(df)
+def render_summary_cards(
+    df: pd.DataFrame, fingerprint: str | None = None, table: pd.DataFrame | None = None
+) -> None:
+    """Render five summary KPI cards with value and delta.
+
+    Pass the caller's frame_fingerprint(df) as fingerprint to avoid hashing df again,
+    and df's kpi_table as table to skip recomputing the KPIs from its rows.
+    """
+    # Reruns with an unchanged frame reuse the last summary without a cache round-trip
+    fp = fingerprint if fingerprint is not None else frame_fingerprint(df)
+    if st.session_state.get("_kpi_fp") == fp:
+        data = st.session_state["_kpi_data"]
+    else:
+        data = _summary_from_table(table, df) if table is not None else _compute_summary_cached(fp, df)
+        st.session_state["_kpi_fp"] = fp
+        st.session_state["_kpi_data"] = data
     cols = st.columns(5)
     labels = [
         "Velocity (SP)", "Throughput (issues)", "Carryover rate",
@@ -1,16 +1,39 @@
 from __future__ import annotations
 from typing import Iterable
+import hashlib
 import pandas as pd
+from pandas.api.types import is_numeric_dtype
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """Cheap content key for a frame, for caches that should not hash it themselves.
+
+    Covers row order, column names and dtypes, so reordered or renamed frames get new keys.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr([(c, str(t)) for c, t in df.dtypes.items()]).encode())
+    h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return f"{len(df)}:{h.hexdigest()}"
 
 def coerce_dates(df: pd.DataFrame, cols: Iterable[str]) -> None:
-    for c in cols:
-        if c in df.columns:
-            df[c] = pd.to_datetime(df[c], errors="coerce", utc=True)
+    # Already tz-aware columns are skipped; the rest are written back in one assignment
+    todo = [c for c in cols if c in df.columns and not isinstance(df[c].dtype, pd.DatetimeTZDtype)]
+    if todo:
+        df[todo] = df[todo].apply(pd.to_datetime, errors="coerce", utc=True)
 
 def coerce_nums(df: pd.DataFrame, cols: Iterable[str]) -> None:
-    for c in cols:
-        if c in df.columns:
-            df[c] = pd.to_numeric(df[c], errors="coerce")
+    todo = [c for c in cols if c in df.columns and not is_numeric_dtype(df[c])]
+    if todo:
+        df[todo] = df[todo].apply(pd.to_numeric, errors="coerce")
+
+def _nan_to_none(df: pd.DataFrame, c: str) -> None:
+    arr = df[c].to_numpy()
+    na = pd.isna(arr)
+    if not na.any():
+        return  # nothing to convert; keep the column's dtype
+    # One object copy with None written in place, instead of astype + where
+    out = arr.astype(object, copy=True)
+    out[na] = None
+    df[c] = out
 
 def nan_to_none_for_optional(
     df: pd.DataFrame,
@@ -19,9 +42,7 @@ def nan_to_none_for_optional(
 ) -> None:
     for c in optional_str_cols:
         if c in df.columns:
-            s = df[c].astype("object")
-            df[c] = s.where(pd.notna(s), None)
+            _nan_to_none(df, c)
     for c in optional_num_cols:
         if c in df.columns:
-            s = df[c].astype("object")
-            df[c] = s.where(pd.notna(s), None)
+            _nan_to_none(df, c)
@@ -1,32 +1,26 @@
 import sys
 import os
+import hashlib
 
 sys.path.append(
     os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
 )
 
 import streamlit as st
+import numpy as np
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 
-from app.lib.data_access import load_sprint_csv
+from app.lib.data_access import categorize, load_validated_csv, read_csv_bytes
 from app.lib.schema import validate_and_normalize
-from app.lib.kpis import (
-    calc_velocity,
-    calc_throughput,
-    calc_carryover_rate,
-    calc_cycle_time,
-    calc_defect_ratio,
-)
+from app.lib.kpis import kpi_frames, kpi_parts, kpi_table_from_parts
 from app.lib.ui_kpis import render_summary_cards
+from app.lib.utils import frame_fingerprint
 from app.lib.adapt import (
     infer_mapping,
     apply_mapping,
     REQUIRED_CANONICAL,
     OPTIONAL_CANONICAL,
 )
-from app.lib.plot_helpers import tidy
 
 TEMPLATE_COLUMNS = [
     "issue_id",
@@ -50,6 +44,10 @@ def make_template_df() -> pd.DataFrame:
     return pd.DataFrame(columns=TEMPLATE_COLUMNS)
 
 
+# The template is constant; encode it once per process, not on every rerun
+_TEMPLATE_CSV_BYTES = make_template_df().to_csv(index=False).encode("utf-8")
+
+
 SESSION_KEY = "validated_df"
 SOURCE_KEY = "data_source"
 SHARED_DF_KEY = "df_current"
@@ -57,6 +55,10 @@ SHARED_SRC_KEY = "source_label"
 RAW_UPLOAD_KEY = "raw_upload_df"
 MAPPING_KEY = "current_mapping"
 ERROR_LOG_KEY = "upload_error_log"
+ENRICHED_DF_KEY = "enriched_df"
+DATA_VERSION_KEY = "data_version"
+
+STATIC_TABLE_MAX_ROWS = 200
 
 
 st.set_page_config(page_title="Overview · SprintSense", layout="wide")
@@ -64,27 +66,109 @@ st.title("Overview")
 st.caption("Upload a Jira style CSV or use the bundled sample.")
 
 
+def _hash_bytes(b: bytes) -> str:
+    """Cache key for uploaded bytes; not a security hash."""
+    # stdlib blake2b is faster than md5 and always available, so there is one key scheme
+    return hashlib.blake2b(b, digest_size=16).hexdigest()
+
+
+# Bytes are passed underscored so Streamlit keys these caches on the short
+# digest alone instead of hashing the whole upload on every rerun.
 @st.cache_data(show_spinner=False)
-def _read_and_validate(path: str) -> pd.DataFrame:
-    df = load_sprint_csv(path)
-    return validate_and_normalize(df)
+def _load_csv_bytes(digest: str, _raw: bytes) -> pd.DataFrame:
+    return read_csv_bytes(_raw)
 
 
 @st.cache_data(show_spinner=False)
-def _load_csv_bytes(file) -> pd.DataFrame:
-    return pd.read_csv(file)
+def _validated_from_hash(digest: str, _raw: bytes) -> pd.DataFrame:
+    return categorize(validate_and_normalize(_load_csv_bytes(digest, _raw)))
+
+
+# One entry per filtered frame; keep the last few filter selections
+@st.cache_data(show_spinner=False, max_entries=16)
+def _compute_kpis(
+    fingerprint: str, _parts: pd.DataFrame
+) -> tuple[pd.DataFrame, dict[str, pd.DataFrame]]:
+    # Keyed on the filtered frame's fingerprint only; sidebar reruns with the same filter hit the cache
+    table = kpi_table_from_parts(_parts)
+    return table, kpi_frames(table)
+
+
+# (KPI frame key, column, title, bar?) per chart; selected ones share a single subplot figure
+CHART_SPECS = [
+    ("velocity", "velocity_sp", "Velocity by sprint", True),
+    ("throughput", "throughput_issues", "Throughput by sprint", True),
+    ("carryover", "carryover_rate", "Carryover rate", False),
+    ("cycle_time", "cycle_median_days", "Cycle time (median days)", False),
+    ("defect_ratio", "defect_ratio", "Defect ratio", False),
+]
+
+
+# Keyed on (filtered frame, KPI selection); keep the recent combinations only
+@st.cache_data(show_spinner=False, max_entries=16)
+def _kpi_figure(fingerprint: str, selected: tuple[str, ...], _kpis: dict[str, pd.DataFrame]):
+    """Subplot figure of the selected KPI charts, cached per filtered frame and selection."""
+    # Plotly is the heaviest import on the page; only pay for it when a chart renders
+    from plotly.subplots import make_subplots
+    from app.lib.plot_helpers import tidy
+
+    charts = [spec for spec in CHART_SPECS if spec[1] in selected]
+    # One figure ships one JSON payload and one Plotly render instead of five
+    n_rows = (len(charts) + 1) // 2
+    fig = make_subplots(
+        rows=n_rows,
+        cols=2,
+        subplot_titles=[title for _, _, title, _ in charts],
+        vertical_spacing=0.12 if n_rows > 1 else 0.2,
+    )
+    for i, (key, col, title, is_bar) in enumerate(charts):
+        row, pos = divmod(i, 2)
+        frame = _kpis[key]
+        x, y = frame["sprint_id"].to_numpy(), frame[col].to_numpy()
+        if is_bar:
+            fig.add_bar(x=x, y=y, name=title, row=row + 1, col=pos + 1)
+        else:
+            fig.add_scatter(x=x, y=y, mode="lines+markers", name=title, row=row + 1, col=pos + 1)
+    fig = tidy(fig)
+    fig.update_layout(height=360 * n_rows, showlegend=False)
+    return fig
+
+
+def _source_label(source: str, df: pd.DataFrame) -> str:
+    # sprint_id is freshly categorized on load, so its categories are exactly the ids present
+    return f"Using {source} · {len(df)} rows · {len(df['sprint_id'].cat.categories)} sprint(s)"
+
+
+def _bump_data_version() -> None:
+    """Mark the session dataset as replaced so derived state is rebuilt."""
+    st.session_state[DATA_VERSION_KEY] = st.session_state.get(DATA_VERSION_KEY, 0) + 1
+
+
+def _enriched_parts(df: pd.DataFrame) -> pd.DataFrame:
+    """Per-row KPI inputs for the session dataset, rebuilt only when it changes."""
+    version = st.session_state.get(DATA_VERSION_KEY, 0)
+    cached = st.session_state.get(ENRICHED_DF_KEY)
+    if cached is None or cached[0] != version:
+        cached = (version, kpi_parts(df))
+        st.session_state[ENRICHED_DF_KEY] = cached
+    return cached[1]
+
+
+# Each entry is a full encoded CSV, so keep only the last few filter selections
+@st.cache_data(show_spinner=False, max_entries=4)
+def _csv_bytes(fingerprint: str, _df: pd.DataFrame) -> bytes:
+    # Download payload is built on every render; cache it per filtered frame
+    return _df.to_csv(index=False).encode("utf-8")
 
 
 def _ensure_state_defaults() -> None:
     if SESSION_KEY not in st.session_state:
-        df0 = _read_and_validate("data/sample_sprint.csv")
+        df0 = load_validated_csv("data/sample_sprint.csv")
         st.session_state[SESSION_KEY] = df0
+        _bump_data_version()
         st.session_state[SOURCE_KEY] = "sample: data/sample_sprint.csv"
         st.session_state[SHARED_DF_KEY] = df0
-        st.session_state[SHARED_SRC_KEY] = (
-            f"Using {st.session_state[SOURCE_KEY]} · {len(df0)} rows · "
-            f"{df0['sprint_id'].nunique()} sprint(s)"
-        )
+        st.session_state[SHARED_SRC_KEY] = _source_label(st.session_state[SOURCE_KEY], df0)
 
     if RAW_UPLOAD_KEY not in st.session_state:
         st.session_state[RAW_UPLOAD_KEY] = None
@@ -131,10 +215,9 @@ def _data_dictionary() -> None:
 
 
 def _download_template_button_global() -> None:
-    template_df = make_template_df()
     st.download_button(
         "Download CSV template",
-        data=template_df.to_csv(index=False).encode("utf-8"),
+        data=_TEMPLATE_CSV_BYTES,
         file_name="sprintsense_template.csv",
         mime="text/csv",
         use_container_width=True,
@@ -148,9 +231,15 @@ def _render_health_check(df: pd.DataFrame) -> None:
     total_issues = len(df)
     n_sprints = df["sprint_id"].nunique() if "sprint_id" in df.columns else 0
 
+    # Validated story points are numeric (None where blank): read them as one float64 buffer
+    sp = (
+        df["story_points"].to_numpy(dtype=np.float64, na_value=np.nan)
+        if "story_points" in df.columns else None
+    )
     sp_per_sprint = None
-    if "story_points" in df.columns and n_sprints > 0:
-        sp_per_sprint = df.groupby("sprint_id")["story_points"].sum().mean()
+    if sp is not None and n_sprints > 0:
+        # Mean of per-sprint sums == total over sprint rows / sprint count; no groupby needed
+        sp_per_sprint = float(np.nansum(sp[df["sprint_id"].notna().to_numpy()])) / n_sprints
 
     c1, c2, c3 = st.columns(3)
     with c1:
@@ -163,16 +252,16 @@ def _render_health_check(df: pd.DataFrame) -> None:
         else:
             st.metric("Avg story points per sprint", "n/a")
 
-    optional_missing = []
-    for col in OPTIONAL_CANONICAL:
-        if col not in df.columns or df[col].isna().all():
-            optional_missing.append(col)
+    # One isna pass over every column the checks below look at
+    checked = [c for c in dict.fromkeys([*OPTIONAL_CANONICAL, "resolved"]) if c in df.columns]
+    isna_all = df[checked].isna().all()
+    optional_missing = [c for c in OPTIONAL_CANONICAL if isna_all.get(c, True)]
 
     notes = []
-    if "resolved" in df.columns and df["resolved"].isna().all():
+    if isna_all.get("resolved", False):
         notes.append("No resolved dates found. Cycle time may not be meaningful.")
 
-    if "story_points" in df.columns and df["story_points"].fillna(0).sum() == 0:
+    if sp is not None and np.nansum(sp) == 0:
         notes.append("Story points are all blank or zero. Velocity falls back to issue counts.")
 
     if optional_missing or notes:
@@ -186,28 +275,33 @@ def _render_health_check(df: pd.DataFrame) -> None:
                 st.markdown(f"- {n}")
 
 
+@st.cache_data(show_spinner=False)
+def _cached_infer_mapping(columns: tuple[str, ...]) -> dict[str, str | None]:
+    # infer_mapping only reads headers, so the column tuple is a complete key
+    return infer_mapping(pd.DataFrame(columns=list(columns)))
+
+
 def _mapping_ui(df_raw: pd.DataFrame) -> None:
     st.markdown("#### Map columns")
     st.caption(
         "Map your CSV headers to SprintSense fields. Pre selections come from auto detection."
     )
 
-    detected = infer_mapping(df_raw)
+    detected = _cached_infer_mapping(tuple(df_raw.columns))
     stored = st.session_state.get(MAPPING_KEY) or {}
 
+    # Same choices for every field: build them and their positions once
+    options = ["<none>", *df_raw.columns]
+    option_index = {c: i for i, c in enumerate(options) if i}
+
     cols_left, cols_right = st.columns(2)
 
     req_mapping: dict[str, str | None] = {}
     with cols_left:
         st.subheader("Required")
         for key in REQUIRED_CANONICAL:
-            options = ["<none>"] + list(df_raw.columns)
             default = stored.get(key) or detected.get(key)
-
-            if default in df_raw.columns:
-                index = options.index(default)
-            else:
-                index = 0
+            index = option_index.get(default, 0)
 
             choice = st.selectbox(
                 key,
@@ -221,13 +315,8 @@ def _mapping_ui(df_raw: pd.DataFrame) -> None:
     with cols_right:
         st.subheader("Optional")
         for key in OPTIONAL_CANONICAL:
-            options = ["<none>"] + list(df_raw.columns)
             default = stored.get(key) or detected.get(key)
-
-            if default in df_raw.columns:
-                index = options.index(default)
-            else:
-                index = 0
+            index = option_index.get(default, 0)
 
             choice = st.selectbox(
                 key,
@@ -281,14 +370,13 @@ def _mapping_ui(df_raw: pd.DataFrame) -> None:
     if confirm:
         try:
             adapted = apply_mapping(df_raw, mapping)
-            df_clean = validate_and_normalize(adapted)
+            df_clean = categorize(validate_and_normalize(adapted))
 
             st.session_state[SESSION_KEY] = df_clean
+
+            _bump_data_version()
             st.session_state[SHARED_DF_KEY] = df_clean
-            st.session_state[SHARED_SRC_KEY] = (
-                f"Using mapped upload · {len(df_clean)} rows · "
-                f"{df_clean['sprint_id'].nunique()} sprint(s)"
-            )
+            st.session_state[SHARED_SRC_KEY] = _source_label("mapped upload", df_clean)
 
             st.session_state[MAPPING_KEY] = mapping
             st.session_state[ERROR_LOG_KEY] = None
@@ -308,10 +396,9 @@ _data_dictionary()
 with st.expander("Upload sprint CSV", expanded=False):
     st.caption("Need a starting point for your data? Download the normalized CSV template.")
 
-    tmpl_df = make_template_df()
     st.download_button(
         "Download CSV template",
-        data=tmpl_df.to_csv(index=False).encode("utf-8"),
+        data=_TEMPLATE_CSV_BYTES,
         file_name="sprintsense_template.csv",
         mime="text/csv",
         use_container_width=True,
@@ -336,17 +423,19 @@ with st.expander("Upload sprint CSV", expanded=False):
         _download_template_button_global()
 
     if use_uploaded and up is not None:
+        raw = up.getvalue()
+        digest = _hash_bytes(raw)
+        df_raw = None
         try:
-            df_raw = _load_csv_bytes(up)
-            df_clean = validate_and_normalize(df_raw)
+            df_raw = _load_csv_bytes(digest, raw)
+            df_clean = _validated_from_hash(digest, raw)
 
             st.session_state[SESSION_KEY] = df_clean
+
+            _bump_data_version()
             st.session_state[SOURCE_KEY] = f"uploaded: {up.name}"
             st.session_state[SHARED_DF_KEY] = df_clean
-            st.session_state[SHARED_SRC_KEY] = (
-                f"Using {st.session_state[SOURCE_KEY]} · {len(df_clean)} rows · "
-                f"{df_clean['sprint_id'].nunique()} sprint(s)"
-            )
+            st.session_state[SHARED_SRC_KEY] = _source_label(st.session_state[SOURCE_KEY], df_clean)
 
             st.session_state[RAW_UPLOAD_KEY] = df_raw
             st.session_state[ERROR_LOG_KEY] = None
@@ -354,22 +443,22 @@ with st.expander("Upload sprint CSV", expanded=False):
             st.toast("Loaded uploaded CSV.", icon="✅")
         except Exception as exc:  # noqa: F841
             msg = str(exc)
-            st.session_state[RAW_UPLOAD_KEY] = _load_csv_bytes(up)
+            # Reuse the parse from the try block; None if the CSV itself was unreadable
+            st.session_state[RAW_UPLOAD_KEY] = df_raw
             st.session_state[ERROR_LOG_KEY] = msg
             st.warning(
                 "Validation failed. Scroll down to map columns and inspect the error report."
             )
 
     if use_sample:
-        df_sm = _read_and_validate("data/sample_sprint.csv")
+        df_sm = load_validated_csv("data/sample_sprint.csv")
 
         st.session_state[SESSION_KEY] = df_sm
+
+        _bump_data_version()
         st.session_state[SOURCE_KEY] = "sample: data/sample_sprint.csv"
         st.session_state[SHARED_DF_KEY] = df_sm
-        st.session_state[SHARED_SRC_KEY] = (
-            f"Using {st.session_state[SOURCE_KEY]} · {len(df_sm)} rows · "
-            f"{df_sm['sprint_id'].nunique()} sprint(s)"
-        )
+        st.session_state[SHARED_SRC_KEY] = _source_label(st.session_state[SOURCE_KEY], df_sm)
 
         st.session_state[RAW_UPLOAD_KEY] = None
         st.session_state[ERROR_LOG_KEY] = None
@@ -400,7 +489,9 @@ with st.expander("Current data preview (first 20 rows)", expanded=False):
 st.markdown("---")
 st.subheader("Filters")
 
-all_sprints = sorted(df_current["sprint_id"].astype(str).unique())
+# sprint_id is categorical and astype("category") sorts its categories, so the
+# option list is already the sorted unique ids with no per-rerun scan of the rows
+all_sprints = df_current["sprint_id"].cat.categories.tolist()
 
 sidebar = st.sidebar
 sidebar.subheader("Filters")
@@ -427,120 +518,64 @@ sel_kpis = sidebar.multiselect(
     default=default_kpis,
 )
 
-if sel_sprints:
-    df_filtered = df_current[df_current["sprint_id"].astype(str).isin(sel_sprints)]
+# Per-row KPI work is done once per dataset; filter clicks only slice it
+parts = _enriched_parts(df_current)
+
+if sel_sprints and len(sel_sprints) < len(all_sprints):
+    # Match on integer category codes and slice once with a boolean mask
+    sid = df_current["sprint_id"].cat
+    mask = np.isin(sid.codes.to_numpy(), sid.categories.get_indexer(sel_sprints))
+    df_filtered = df_current[mask]
+    parts_filtered = parts[mask]
 else:
-    df_filtered = df_current.copy()
+    # Read-only from here on (summary cards, KPIs, CSV export), so alias instead of copying
+    df_filtered = df_current
+    parts_filtered = parts
 
 if df_filtered.empty:
     st.warning("No data for the selected sprint filters.")
     st.stop()
 
+# Hash the filtered frame once; every cache below and the summary cards key on it
+filtered_fp = frame_fingerprint(df_filtered)
+
+# The summary cards reuse the table built from the sliced parts
+kpi_tbl, kpis = _compute_kpis(filtered_fp, parts_filtered)
+
 st.markdown("---")
 st.subheader("Summary")
 
-render_summary_cards(df_filtered)
+render_summary_cards(df_filtered, filtered_fp, kpi_tbl)
 
-vel = calc_velocity(df_filtered)
-thr = calc_throughput(df_filtered)
-car = calc_carryover_rate(df_filtered)
-cyc = calc_cycle_time(df_filtered)
-dr = calc_defect_ratio(df_filtered)
+vel = kpis["velocity"]
+thr = kpis["throughput"]
+car = kpis["carryover"]
+cyc = kpis["cycle_time"]
+dr = kpis["defect_ratio"]
 
-kpi = (
-    vel.merge(thr, on="sprint_id")
-    .merge(car, on="sprint_id")
-    .merge(cyc, on="sprint_id")
-    .merge(dr, on="sprint_id")
-)
+# Column-wise align on sprint_id in one pass; join="inner" keeps the old merge-chain rows
+frames = [f.set_index("sprint_id") for f in (vel, thr, car, cyc, dr)]
+kpi = pd.concat(frames, axis=1, join="inner").sort_index().reset_index()
 
 st.subheader("KPI table")
-st.dataframe(kpi, use_container_width=True)
+# One row per sprint: a static HTML table skips the Arrow serializer on every rerun
+if len(kpi) <= STATIC_TABLE_MAX_ROWS:
+    st.table(kpi)
+else:
+    st.dataframe(kpi, use_container_width=True)
 
 st.subheader("Charts")
 
-c1, c2 = st.columns(2)
-
-if "velocity_sp" in sel_kpis:
-    with c1:
-        st.plotly_chart(
-            tidy(
-                px.bar(
-                    vel,
-                    x="sprint_id",
-                    y="velocity_sp",
-                    title="Velocity by sprint",
-                )
-            ),
-            use_container_width=True,
-        )
-
-if "throughput_issues" in sel_kpis:
-    with c2:
-        st.plotly_chart(
-            tidy(
-                px.bar(
-                    thr,
-                    x="sprint_id",
-                    y="throughput_issues",
-                    title="Throughput by sprint",
-                )
-            ),
-            use_container_width=True,
-        )
-
-c3, c4 = st.columns(2)
-
-if "carryover_rate" in sel_kpis:
-    with c3:
-        st.plotly_chart(
-            tidy(
-                px.line(
-                    car,
-                    x="sprint_id",
-                    y="carryover_rate",
-                    markers=True,
-                    title="Carryover rate",
-                )
-            ),
-            use_container_width=True,
-        )
-
-if "cycle_median_days" in sel_kpis:
-    with c4:
-        st.plotly_chart(
-            tidy(
-                px.line(
-                    cyc,
-                    x="sprint_id",
-                    y="cycle_median_days",
-                    markers=True,
-                    title="Cycle time (median days)",
-                )
-            ),
-            use_container_width=True,
-        )
-
-if "defect_ratio" in sel_kpis:
-    st.plotly_chart(
-        tidy(
-            px.line(
-                dr,
-                x="sprint_id",
-                y="defect_ratio",
-                markers=True,
-                title="Defect ratio",
-            )
-        ),
-        use_container_width=True,
-    )
+selected_charts = tuple(col for _, col, _, _ in CHART_SPECS if col in sel_kpis)
+if selected_charts:
+    st.plotly_chart(_kpi_figure(filtered_fp, selected_charts, kpis), use_container_width=True)
 
 st.markdown("---")
 st.subheader("Download cleaned CSV")
 
 st.download_button(
     "Download cleaned CSV",
-    data=df_filtered.to_csv(index=False).encode("utf-8"),
+    data=_csv_bytes(filtered_fp, df_filtered),
     file_name="sprintsense_cleaned.csv",
     mime="text/csv",
     use_container_width=True,
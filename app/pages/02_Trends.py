@@ -1,25 +1,92 @@
 import sys
 import os
+import re
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
 
 import streamlit as st
+import numpy as np
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 
-from app.lib.data_access import load_sprint_csv
-from app.lib.schema import validate_and_normalize
-from app.lib.kpis import (
-    calc_velocity,
-    calc_throughput,
-    calc_carryover_rate,
-    calc_cycle_time,
-    calc_defect_ratio,
-)
+from app.lib.data_access import load_validated_csv
+from app.lib.kpis import kpi_frames, kpi_table
 from app.lib.forecast import mc_velocity_forecast
 from app.lib.insights import velocity_insights
 from app.lib.plot_helpers import tidy
+from app.lib.utils import frame_fingerprint
+
+
+# Message level from velocity_insights -> Streamlit renderer; unknown levels fall back to st.write
+_LEVEL_FN = {"info": st.info, "success": st.success, "warning": st.warning, "error": st.error}
+
+
+def _plot_y(s: pd.Series) -> np.ndarray:
+    """Trace y values as float32; tables and CSV keep float64, the chart payload halves."""
+    return s.to_numpy(dtype=np.float32, na_value=np.nan)
+
+
+def _tidy_f32(fig: go.Figure, **kwargs) -> go.Figure:
+    """tidy() with a fixed-precision y hover, so float32 widening (0.3 -> 0.30000001) stays hidden."""
+    return tidy(fig, **kwargs).update_traces(hovertemplate="%{x}<br>%{y:.3~f}<extra></extra>")
+
+
+def _line(df: pd.DataFrame, y: str) -> go.Figure:
+    """Markers+line trace of one KPI column over sprint_id, built without plotly.express."""
+    return go.Figure(
+        go.Scatter(x=df["sprint_id"].to_numpy(), y=_plot_y(df[y]), mode="lines+markers")
+    )
+
+
+SAMPLE_PATH = "data/sample_sprint.csv"
+
+
+@st.cache_data(show_spinner=False)
+def _build_kpi_table(fingerprint: str, _df: pd.DataFrame) -> tuple[dict[str, pd.DataFrame], pd.DataFrame]:
+    """KPI frames plus the joined, chronologically ordered table; keyed on the fingerprint only."""
+    # One groupby yields every KPI column; no per-KPI frames to join back together
+    table = kpi_table(_df)
+    kpis = kpi_frames(table)
+    # Sprints with resolved work, i.e. the rows an inner join of the five frames keeps
+    kpi = (
+        table.dropna(subset=["throughput_issues"])
+        .astype({"throughput_issues": "int64"})
+        .reset_index()
+    )
+
+    # sprint_start is constant per sprint: dedup the k sprints instead of a groupby-min,
+    # then order the small KPI table by its sprints' starts
+    starts = (
+        _df[["sprint_id", "sprint_start"]]
+        .dropna(subset=["sprint_id"])
+        .drop_duplicates("sprint_id")
+        .set_index("sprint_id")["sprint_start"]
+    )
+    kpi = (
+        kpi.assign(_start=starts.reindex(kpi["sprint_id"]).array)
+        .sort_values("_start", kind="stable")
+        .drop(columns="_start")
+        .reset_index(drop=True)
+    )
+    return kpis, kpi
+
+
+@st.cache_data(show_spinner=False)
+def _kpi_chart(fingerprint: str, y: str, title: str, y_title: str, _kpi: pd.DataFrame) -> go.Figure:
+    """Styled per-KPI line chart, cached per source frame so reruns skip figure construction."""
+    return _tidy_f32(_line(_kpi, y), title=title, x_title="Sprint", y_title=y_title)
+
+
+# Each (data, horizon, draws) combination is a separate entry; keep the last few
+@st.cache_data(show_spinner="Running Monte Carlo…", max_entries=16)
+def _forecast(fingerprint: str, horizon: int, draws: int, _df: pd.DataFrame) -> pd.DataFrame:
+    return mc_velocity_forecast(_df, horizon=horizon, draws=draws)
+
+
+@st.cache_data(show_spinner=False)
+def _kpi_csv_bytes(fingerprint: str, _kpi: pd.DataFrame) -> bytes:
+    # Keyed on the source frame's fingerprint, which fully determines the KPI table
+    return _kpi.to_csv(index=False).encode("utf-8")
 
 
 def render_kpi_comparison(trends_df: pd.DataFrame, selected_kpis: list[str]) -> None:
@@ -42,16 +109,17 @@ def render_kpi_comparison(trends_df: pd.DataFrame, selected_kpis: list[str]) ->
 
         fig.add_trace(
             go.Scatter(
-                x=trends_df["sprint_id"],
-                y=trends_df[col],
+                x=trends_df["sprint_id"].to_numpy(),
+                y=_plot_y(trends_df[col]),
                 mode="lines+markers",
                 name=col.replace("_", " "),
             )
         )
 
-    title_text = f"Selected KPI trends across {trends_df['sprint_id'].nunique()} sprint(s)"
+    # KPI rows are one per sprint
+    title_text = f"Selected KPI trends across {len(trends_df)} sprint(s)"
 
-    fig = tidy(
+    fig = _tidy_f32(
         fig,
         title=title_text,
         x_title="Sprint",
@@ -86,10 +154,10 @@ if _df is None:
 source_label = st.session_state.get("data_source") or st.session_state.get("source_label")
 
 if _df is None:
-    _df = validate_and_normalize(load_sprint_csv("data/sample_sprint.csv"))
+    _df = load_validated_csv(SAMPLE_PATH)
     sprints = _df["sprint_id"].nunique()
     rows = len(_df)
-    source_label = f"Using sample: data/sample_sprint.csv · {rows} rows · {sprints} sprint(s)"
+    source_label = f"Using sample: {SAMPLE_PATH} · {rows} rows · {sprints} sprint(s)"
 
 if source_label:
     st.info(source_label)
@@ -128,29 +196,9 @@ if null_rate_velocity_inputs is not None and (null_rate_velocity_inputs > 0.2).a
     )
 
 # KPI table
-vel = calc_velocity(_df)
-thr = calc_throughput(_df)
-car = calc_carryover_rate(_df)
-cyc = calc_cycle_time(_df)
-dr = calc_defect_ratio(_df)
-
-kpi = (
-    vel.merge(thr, on="sprint_id")
-    .merge(car, on="sprint_id")
-    .merge(cyc, on="sprint_id")
-    .merge(dr, on="sprint_id")
-)
-
-order = (
-    _df.groupby("sprint_id")["sprint_start"]
-    .min()
-    .sort_values()
-    .index
-    .tolist()
-)
-
-kpi["sprint_id"] = pd.Categorical(kpi["sprint_id"], categories=order, ordered=True)
-kpi = kpi.sort_values("sprint_id").reset_index(drop=True)
+data_fp = frame_fingerprint(_df)
+kpis, kpi = _build_kpi_table(data_fp, _df)
+vel = kpis["velocity"]
 
 st.subheader("KPI trends (per sprint)")
 st.dataframe(kpi, use_container_width=True)
@@ -158,7 +206,9 @@ st.dataframe(kpi, use_container_width=True)
 # Filters for trends
 st.sidebar.subheader("Filters")
 
-all_sprints = list(kpi["sprint_id"].astype(str).unique())
+# String view of the sprint ids, built once and shared by the filter and the forecast labels
+sid_str = kpi["sprint_id"].astype(str)
+all_sprints = sid_str.unique().tolist()
 sprint_range = st.sidebar.multiselect(
     "Select sprint(s)",
     all_sprints,
@@ -179,7 +229,7 @@ selected_kpis = st.sidebar.multiselect(
     default=["velocity_sp", "throughput_issues"],
 )
 
-kpi_filtered = kpi[kpi["sprint_id"].astype(str).isin(sprint_range)]
+kpi_filtered = kpi[sid_str.isin(sprint_range)]
 
 # KPI comparison chart
 render_kpi_comparison(kpi_filtered, selected_kpis)
@@ -187,7 +237,7 @@ render_kpi_comparison(kpi_filtered, selected_kpis)
 # Export KPI table
 st.download_button(
     "Download KPI trends (CSV)",
-    data=kpi.to_csv(index=False).encode("utf-8"),
+    data=_kpi_csv_bytes(data_fp, kpi),
     file_name="kpi_trends.csv",
     mime="text/csv",
     use_container_width=True,
@@ -199,54 +249,29 @@ st.subheader("Charts")
 c1, c2 = st.columns(2)
 with c1:
     st.plotly_chart(
-        tidy(
-            px.line(kpi, x="sprint_id", y="velocity_sp", markers=True),
-            title="Velocity (SP)",
-            x_title="Sprint",
-            y_title="Story points (SP)",
-        ),
+        _kpi_chart(data_fp, "velocity_sp", "Velocity (SP)", "Story points (SP)", kpi),
         use_container_width=True,
     )
 with c2:
     st.plotly_chart(
-        tidy(
-            px.line(kpi, x="sprint_id", y="throughput_issues", markers=True),
-            title="Throughput (issues)",
-            x_title="Sprint",
-            y_title="Issues",
-        ),
+        _kpi_chart(data_fp, "throughput_issues", "Throughput (issues)", "Issues", kpi),
         use_container_width=True,
     )
 
 c3, c4 = st.columns(2)
 with c3:
     st.plotly_chart(
-        tidy(
-            px.line(kpi, x="sprint_id", y="carryover_rate", markers=True),
-            title="Carryover rate",
-            x_title="Sprint",
-            y_title="Rate",
-        ),
+        _kpi_chart(data_fp, "carryover_rate", "Carryover rate", "Rate", kpi),
         use_container_width=True,
     )
 with c4:
     st.plotly_chart(
-        tidy(
-            px.line(kpi, x="sprint_id", y="cycle_median_days", markers=True),
-            title="Cycle time (median days)",
-            x_title="Sprint",
-            y_title="Days",
-        ),
+        _kpi_chart(data_fp, "cycle_median_days", "Cycle time (median days)", "Days", kpi),
         use_container_width=True,
     )
 
 st.plotly_chart(
-    tidy(
-        px.line(kpi, x="sprint_id", y="defect_ratio", markers=True),
-        title="Defect ratio",
-        x_title="Sprint",
-        y_title="Share",
-    ),
+    _kpi_chart(data_fp, "defect_ratio", "Defect ratio", "Share", kpi),
     use_container_width=True,
 )
 
@@ -272,48 +297,41 @@ with cB:
         format="%d",
     )
 
-if kpi["sprint_id"].nunique() < 3:
+# The KPI table has one row per sprint, so its length is the sprint count
+if len(kpi) < 3:
     st.warning(
         "Forecast confidence is low (limited history). Add more sprints for better accuracy."
     )
 
-# Use raw validated frame for forecast regardless of sidebar filters
-df_raw = st.session_state.get("validated_df", None)
-if df_raw is None:
-    df_raw = st.session_state.get("df_current", None)
-if df_raw is None:
-    df_raw = validate_and_normalize(load_sprint_csv("data/sample_sprint.csv"))
-
-fc_base = mc_velocity_forecast(
-    df_raw,
-    horizon=int(horizon),
-    draws=int(draws),
-)
+# Use raw validated frame for forecast regardless of sidebar filters; _df was resolved
+# from the same session keys (and sample fallback) at the top of the page
+df_raw = _df
+
+# Only rebuilt when the data, horizon or draw count change, not on every sidebar click
+fc_base = _forecast(data_fp, int(horizon), int(draws), df_raw)
+
+
+_DIGITS_RE = re.compile(r"\d+")
 
 
 def _infer_last_sprint_num(ids: pd.Series) -> int | None:
-    for s in ids.astype(str)[::-1]:
-        nums = "".join(ch if ch.isdigit() else " " for ch in s).split()
-        if nums:
-            try:
-                return int(nums[-1])
-            except ValueError:
-                continue
+    # Newest id first; stop at the first one carrying digits and take its last digit run
+    for s in ids.to_numpy(dtype=object)[::-1]:
+        m = _DIGITS_RE.findall(str(s))
+        if m:
+            return int(m[-1])
     return None
 
 
-last_num = _infer_last_sprint_num(kpi["sprint_id"])
+last_num = _infer_last_sprint_num(sid_str)
 if last_num is not None:
     fc_base["future_sprint"] = [f"S{last_num + i}" for i in fc_base["step"]]
 else:
     fc_base["future_sprint"] = fc_base["step"].astype(str)
 
-for level, msg in velocity_insights(df_raw, fc_base):
-    fn = getattr(st, level, None)
-    if callable(fn):
-        fn(msg)
-    else:
-        st.write(msg)
+# vel was computed from the same validated frame above; reuse it instead of recomputing
+for level, msg in velocity_insights(df_raw, fc_base, vel_hist=vel["velocity_sp"].to_numpy(dtype=float)):
+    _LEVEL_FN.get(level, st.write)(msg)
 
 st.dataframe(
     fc_base.rename(
@@ -330,16 +348,16 @@ st.dataframe(
 fig_fc = go.Figure()
 fig_fc.add_trace(
     go.Scatter(
-        x=fc_base["future_sprint"],
-        y=fc_base["p90"],
+        x=fc_base["future_sprint"].to_numpy(),
+        y=_plot_y(fc_base["p90"]),
         name="p90",
         line=dict(width=1.5),
     )
 )
 fig_fc.add_trace(
     go.Scatter(
-        x=fc_base["future_sprint"],
-        y=fc_base["p10"],
+        x=fc_base["future_sprint"].to_numpy(),
+        y=_plot_y(fc_base["p10"]),
         name="p10",
         line=dict(width=1.5),
         fill="tonexty",
@@ -348,14 +366,14 @@ fig_fc.add_trace(
 )
 fig_fc.add_trace(
     go.Scatter(
-        x=fc_base["future_sprint"],
-        y=fc_base["p50"],
+        x=fc_base["future_sprint"].to_numpy(),
+        y=_plot_y(fc_base["p50"]),
         name="p50 (median)",
         mode="lines+markers",
         line=dict(width=2),
     )
 )
-fig_fc = tidy(
+fig_fc = _tidy_f32(
     fig_fc,
     title="Velocity forecast",
     x_title="Future sprint",
@@ -411,9 +429,13 @@ with st.expander("Adjust assumptions", expanded=True):
     eff_mult = capacity_mult / (1 + scope_growth / 100) / (1 + defect_uplift / 100)
     st.caption(f"Effective multiplier on velocity: **{eff_mult:.3f}**")
 
+    # Scale all four forecast columns as one 2-D block: one multiply, one round, in place
+    cols = ["mean", "p10", "p50", "p90"]
+    arr = fc_base[cols].to_numpy(dtype=np.float64, copy=True)
+    np.multiply(arr, eff_mult, out=arr)
+    np.round(arr, 2, out=arr)
     fc_adj = fc_base.copy()
-    for col in ["mean", "p10", "p50", "p90"]:
-        fc_adj[col] = (fc_adj[col] * eff_mult).round(2)
+    fc_adj[cols] = arr
 
     base_p50 = fc_base.loc[0, "p50"]
     adj_p50 = fc_adj.loc[0, "p50"]
@@ -524,21 +546,21 @@ st.subheader("Base vs what if (median)")
 fig_overlay = go.Figure()
 fig_overlay.add_trace(
     go.Scatter(
-        x=fc_base["future_sprint"],
-        y=fc_base["p50"],
+        x=fc_base["future_sprint"].to_numpy(),
+        y=_plot_y(fc_base["p50"]),
         name="Base p50",
         mode="lines+markers",
     )
 )
 fig_overlay.add_trace(
     go.Scatter(
-        x=fc_adj["future_sprint"],
-        y=fc_adj["p50"],
+        x=fc_adj["future_sprint"].to_numpy(),
+        y=_plot_y(fc_adj["p50"]),
         name="What if p50",
         mode="lines+markers",
     )
 )
-fig_overlay = tidy(
+fig_overlay = _tidy_f32(
     fig_overlay,
     title="Median velocity: base vs what if",
     x_title="Future sprint",
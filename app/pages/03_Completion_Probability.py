@@ -8,8 +8,7 @@ import pandas as pd
 import plotly.express as px
 import streamlit as st
 
-from app.lib.data_access import load_sprint_csv
-from app.lib.schema import validate_and_normalize
+from app.lib.data_access import load_validated_csv
 from app.lib.forecast import velocity_history
 
 
@@ -21,8 +20,7 @@ def _get_validated_df() -> pd.DataFrame:
     if "validated_df" in st.session_state and st.session_state["validated_df"] is not None:
         return st.session_state["validated_df"]
 
-    df_raw = load_sprint_csv(str(SAMPLE_PATH))
-    df_valid = validate_and_normalize(df_raw, validate_rows=True)
+    df_valid = load_validated_csv(str(SAMPLE_PATH))
 
     st.session_state["validated_df"] = df_valid
     st.session_state["data_source"] = f"Bundled sample CSV ({SAMPLE_PATH})"
@@ -63,7 +61,7 @@ def _simulate_completion_probability(
         raise ValueError("Not enough historical data for simulation.")
 
     rng = np.random.default_rng(seed)
-    samples = rng.choice(values, size=draws, replace=True)
+    samples = values[rng.integers(0, values.size, size=draws)]
 
     prob_meet = float((samples >= commitment_sp).mean()) if commitment_sp > 0 else 1.0
 
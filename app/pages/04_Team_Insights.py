@@ -6,8 +6,7 @@ import pandas as pd
 import streamlit as st
 
 from app.lib import kpis
-from app.lib.data_access import load_sprint_csv
-from app.lib.schema import validate_and_normalize
+from app.lib.data_access import load_validated_csv
 
 
 SAMPLE_PATH = "data/sample_sprint.csv"
@@ -17,8 +16,7 @@ def _get_validated_df() -> pd.DataFrame:
     if "validated_df" in st.session_state and st.session_state["validated_df"] is not None:
         return st.session_state["validated_df"]
 
-    df_raw = load_sprint_csv(SAMPLE_PATH)
-    df_valid = validate_and_normalize(df_raw, validate_rows=True)
+    df_valid = load_validated_csv(SAMPLE_PATH)
 
     st.session_state["validated_df"] = df_valid
     st.session_state["data_source"] = f"Bundled sample CSV ({SAMPLE_PATH})"
@@ -29,16 +27,14 @@ def _get_validated_df() -> pd.DataFrame:
 
 
 def _build_kpi_table(df: pd.DataFrame) -> pd.DataFrame:
-    vel = kpis.calc_velocity(df)
-    thr = kpis.calc_throughput(df)
-    cov = kpis.calc_carryover_rate(df)
-    cyc = kpis.calc_cycle_time(df)
-    dfx = kpis.calc_defect_ratio(df)
-
-    kpi_df = vel.merge(thr, on="sprint_id", how="left")
-    kpi_df = kpi_df.merge(cov, on="sprint_id", how="left")
-    kpi_df = kpi_df.merge(cyc, on="sprint_id", how="left")
-    kpi_df = kpi_df.merge(dfx, on="sprint_id", how="left")
+    # kpi_table already holds all five KPIs side by side; keep the sprints with
+    # resolved work (the velocity rows) instead of splitting and re-joining frames
+    table = kpis.kpi_table(df)
+    kpi_df = (
+        table[table["throughput_issues"].notna()]
+        .astype({"throughput_issues": "int64"})
+        .reset_index()
+    )
 
     def _sprint_sort_key(x: str) -> int:
         if not isinstance(x, str):
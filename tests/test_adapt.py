@@ -0,0 +1,14 @@
+import pandas as pd
+from app.lib.adapt import infer_mapping
+
+def test_infer_mapping_synonyms_and_shared_phrases():
+    df = pd.DataFrame(columns=["Key", "Issue Type", "Story Points", "Sprint Name", "Created Date", "Sprint"])
+    m = infer_mapping(df)
+    assert m["issue_id"] == "Key"
+    assert m["issue_type"] == "Issue Type"
+    assert m["story_points"] == "Story Points"
+    assert m["created"] == "Created Date"
+    # "sprint" outranks "sprint name" for sprint_id; "sprint name" still maps sprint_name
+    assert m["sprint_id"] == "Sprint"
+    assert m["sprint_name"] == "Sprint Name"
+    assert m["resolved"] is None
@@ -1,5 +1,7 @@
+import os
+import pandas as pd
 import pytest
-from app.lib.data_access import load_sprint_csv
+from app.lib.data_access import load_sprint_csv, load_validated_csv, read_csv_bytes
 
 def test_load_sprint_csv_ok(tmp_path):
     p = tmp_path/"s.csv"
@@ -10,8 +12,41 @@ def test_load_sprint_csv_ok(tmp_path):
     df = load_sprint_csv(str(p))
     assert set({"issue_id","issue_type","created"}) <= set(df.columns)
 
+def test_load_sprint_csv_pads_short_rows(tmp_path):
+    p = tmp_path/"short.csv"
+    p.write_text(
+        "issue_id,issue_type,status,story_points,created,resolved,sprint_id,sprint_start,sprint_end,parent_id,labels\n"
+        "X-1,story,Done,3,2025-01-01T00:00:00Z,2025-01-02T00:00:00Z,S1,2025-01-01T00:00:00Z,2025-01-14T00:00:00Z\n"
+    )
+    df = load_sprint_csv(str(p))
+    assert len(df) == 1
+    assert df[["parent_id", "labels"]].isna().all(axis=None)
+
 def test_load_sprint_csv_missing_cols(tmp_path):
     p = tmp_path/"bad.csv"
     p.write_text("issue_id\nX-1\n")
     with pytest.raises(ValueError):
         load_sprint_csv(str(p))
+
+def test_read_csv_bytes():
+    df = read_csv_bytes(b"issue_id,story_points\nX-1,3\nX-2,5\n")
+    assert df["story_points"].tolist() == [3, 5]
+
+def test_read_csv_bytes_pads_short_rows():
+    df = read_csv_bytes(b"issue_id,story_points,labels\nX-1,3,ui\nX-2,5\n")
+    assert df.shape == (2, 3)
+    assert df["labels"].isna().tolist() == [False, True]
+
+def test_load_validated_csv_rebuilds_corrupt_sidecar(tmp_path):
+    p = tmp_path/"s.csv"
+    p.write_text(
+        "issue_id,issue_type,status,story_points,created,resolved,sprint_id,sprint_start,sprint_end\n"
+        "X-1,story,Done,3,2025-01-01T00:00:00Z,2025-01-02T00:00:00Z,S1,2025-01-01T00:00:00Z,2025-01-14T00:00:00Z\n"
+    )
+    pq = tmp_path/"s.parquet"
+    pq.write_bytes(b"truncated")
+    mtime = os.path.getmtime(p)
+    os.utime(pq, (mtime + 1, mtime + 1))
+    df = load_validated_csv(str(p))
+    assert isinstance(df["sprint_id"].dtype, pd.CategoricalDtype)
+    assert pd.read_parquet(pq)["issue_id"].tolist() == ["X-1"]
@@ -22,16 +22,15 @@ def _df_with_velocity(vals):
     return pd.DataFrame(rows)
 
 def test_mc_velocity_forecast_deterministic(monkeypatch):
-    hist = np.array([3.0, 5.0])
+    class FakeRng:
+        # one call per horizon step; indices 0,1,0 -> velocities 3,5,3
+        pattern = iter([0, 1, 0])
 
-    def fake_choice(a, size=None, replace=True):
-        assert np.array_equal(a, hist)
-        # shape (draws, horizon)
-        draws, horizon = size
-        pattern = np.tile(np.array([[3.0, 5.0, 3.0]], dtype=float), (draws, 1))
-        return pattern[:, :horizon]
+        def integers(self, low, high, size=None, dtype=None):
+            assert (low, high) == (0, 2)
+            return np.full(size, next(self.pattern), dtype=np.int32)
 
-    monkeypatch.setattr(np.random, "choice", fake_choice)
+    monkeypatch.setattr(np.random, "default_rng", lambda seed=None: FakeRng())
 
     df = _df_with_velocity([3.0, 5.0])
     fc = mc_velocity_forecast(df, horizon=3, draws=1000)
@@ -47,3 +46,9 @@ def test_mc_velocity_forecast_empty_history():
     fc = mc_velocity_forecast(df, horizon=3, draws=1000)
     assert fc.empty
     assert list(fc.columns) == ["step","mean","p10","p50","p90"]
+
+def test_mc_velocity_forecast_seed_is_reproducible():
+    df = _df_with_velocity([3.0, 5.0, 8.0])
+    a = mc_velocity_forecast(df, horizon=2, draws=500, seed=7)
+    b = mc_velocity_forecast(df, horizon=2, draws=500, seed=7)
+    pd.testing.assert_frame_equal(a, b)
@@ -24,3 +24,26 @@ def test_row_validation_negative_points():
     df.loc[0, "story_points"] = -1
     with pytest.raises(ValueError):
         validate_and_normalize(df)
+
+def test_row_validation_reports_row_and_field():
+    df = pd.concat([_base(), _base()], ignore_index=True)
+    df.loc[1, "created"] = "not a date"
+    with pytest.raises(ValueError, match=r"row 1: 'created' is not a valid date"):
+        validate_and_normalize(df)
+
+def test_row_validation_reports_missing_date_as_required():
+    df = pd.concat([_base(), _base()], ignore_index=True)
+    df.loc[1, "created"] = None
+    with pytest.raises(ValueError, match=r"row 1: 'created' is required"):
+        validate_and_normalize(df)
+
+def test_strict_validation_uses_pydantic_model():
+    df = _base()
+    df.loc[0, "story_points"] = -1
+    with pytest.raises(ValueError, match="Row validation failed"):
+        validate_and_normalize(df, validate_rows="strict")
+
+def test_sprint_id_is_categorical():
+    out = validate_and_normalize(_base())
+    assert isinstance(out["sprint_id"].dtype, pd.CategoricalDtype)
+    assert out["sprint_id"].tolist() == ["S1"]
@@ -1,5 +1,6 @@
 import pandas as pd
-from app.lib.ui_kpis import compute_summary
+from app.lib.kpis import kpi_parts, kpi_table_from_parts
+from app.lib.ui_kpis import compute_summary, _latest_and_delta, _summary_from_table
 
 def _mini_df():
     return pd.DataFrame({
@@ -17,3 +18,11 @@ def _mini_df():
 def test_compute_summary_returns_all_keys():
     out = compute_summary(_mini_df())
     assert {"Velocity (SP)","Throughput (issues)","Carryover rate","Cycle time (days)","Defect ratio"} <= set(out.keys())
+
+def test_latest_and_delta_skips_missing():
+    assert _latest_and_delta(pd.Series([8.0, 10.0, float("nan")])) == (10.0, 25.0)
+
+def test_summary_from_parts_table_matches_compute_summary():
+    df = _mini_df()
+    table = kpi_table_from_parts(kpi_parts(df))
+    assert _summary_from_table(table, df) == compute_summary(df)
@@ -0,0 +1,15 @@
+import pandas as pd
+from app.lib.utils import frame_fingerprint
+
+def _frame():
+    return pd.DataFrame({"sprint_id": ["S1", "S2", "S3"], "story_points": [3, 5, 8]})
+
+def test_frame_fingerprint_is_stable():
+    assert frame_fingerprint(_frame()) == frame_fingerprint(_frame())
+
+def test_frame_fingerprint_sees_row_order_and_column_names():
+    df = _frame()
+    fp = frame_fingerprint(df)
+    assert frame_fingerprint(df.iloc[::-1]) != fp
+    assert frame_fingerprint(df.rename(columns={"story_points": "points"})) != fp
+    assert frame_fingerprint(df.astype({"story_points": "float64"})) != fp